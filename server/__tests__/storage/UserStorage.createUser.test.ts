@@ -0,0 +1,73 @@
+import { describe, it, expect, beforeEach, jest } from '@jest/globals';
+import { UserStorage } from '../../storage/UserStorage';
+import { Landlord, Tenant } from '../../database';
+import { ConflictError } from '../../utils/errorHandler';
+
+// Models are constructors with a static exists(); each test sets what save() does
+jest.mock('../../database', () => ({
+  Landlord: Object.assign(jest.fn(), { exists: jest.fn() }),
+  Tenant: Object.assign(jest.fn(), { exists: jest.fn() }),
+}));
+
+// Skip bcrypt work - hashing is covered in utils/password.test.ts
+jest.mock('../../utils/password', () => ({
+  hashPassword: jest.fn(async () => 'hashed-password'),
+  verifyPassword: jest.fn(),
+}));
+
+const LandlordModel = Landlord as any;
+const TenantModel = Tenant as any;
+
+const newLandlord = {
+  fullName: 'Jane Landlord',
+  email: 'jane@example.com',
+  phone: '0712345678',
+  password: 'SecurePass123!',
+  role: 'landlord' as const,
+};
+
+describe('UserStorage.createUser conflicts', () => {
+  let storage: UserStorage;
+  let save: jest.Mock<any>;
+
+  beforeEach(() => {
+    jest.clearAllMocks();
+    save = jest.fn();
+    LandlordModel.mockImplementation((doc: any) => ({ ...doc, save }));
+    TenantModel.exists.mockResolvedValue(null);
+    storage = new UserStorage();
+  });
+
+  it('should map a duplicate phone (E11000) to a ConflictError', async () => {
+    save.mockRejectedValue({ code: 11000, keyPattern: { phone: 1 } });
+
+    const result = storage.createUser(newLandlord);
+
+    await expect(result).rejects.toBeInstanceOf(ConflictError);
+    await expect(result).rejects.toThrow('User already exists with this phone number');
+  });
+
+  it('should map a duplicate email (E11000) to a ConflictError', async () => {
+    save.mockRejectedValue({ code: 11000, keyPattern: { email: 1 } });
+
+    await expect(storage.createUser(newLandlord)).rejects.toThrow('User already exists with this email');
+  });
+
+  it('should reject an email already registered under the other role', async () => {
+    TenantModel.exists.mockResolvedValue({ _id: 'existing-tenant-id' });
+
+    const result = storage.createUser(newLandlord);
+
+    await expect(result).rejects.toBeInstanceOf(ConflictError);
+    await expect(result).rejects.toThrow('User already exists with this email');
+    expect(TenantModel.exists).toHaveBeenCalledWith({ email: newLandlord.email });
+    expect(save).not.toHaveBeenCalled();
+  });
+
+  it('should rethrow other save errors unchanged', async () => {
+    const dbError = new Error('connection lost');
+    save.mockRejectedValue(dbError);
+
+    await expect(storage.createUser(newLandlord)).rejects.toBe(dbError);
+  });
+});
@@ -0,0 +1,66 @@
+import { describe, it, expect, afterEach, jest } from '@jest/globals';
+import bcrypt from 'bcryptjs';
+import { BCRYPT_MAX_BYTES, truncateToBcryptLimit, verifyPassword } from '../../utils/password';
+
+const utf8Length = (value: string) => Buffer.byteLength(value, 'utf8');
+
+describe('truncateToBcryptLimit', () => {
+  it('should leave passwords within the limit unchanged', () => {
+    expect(truncateToBcryptLimit('SecurePassword123!')).toBe('SecurePassword123!');
+    expect(truncateToBcryptLimit('a'.repeat(BCRYPT_MAX_BYTES))).toBe('a'.repeat(BCRYPT_MAX_BYTES));
+  });
+
+  it('should cut ASCII passwords to exactly 72 bytes', () => {
+    const truncated = truncateToBcryptLimit('a'.repeat(200));
+
+    expect(utf8Length(truncated)).toBe(BCRYPT_MAX_BYTES);
+  });
+
+  it('should keep the code point that straddles the limit whole', () => {
+    // 71 ASCII bytes + a 3-byte character: bcrypt reads the first byte of "€"
+    const password = 'a'.repeat(71) + '€' + 'tail';
+    const truncated = truncateToBcryptLimit(password);
+
+    expect(truncated).toBe('a'.repeat(71) + '€');
+    expect(Buffer.from(truncated).subarray(0, BCRYPT_MAX_BYTES))
+      .toEqual(Buffer.from(password).subarray(0, BCRYPT_MAX_BYTES));
+  });
+
+  it('should not split surrogate pairs', () => {
+    const password = '😀'.repeat(40);
+    const truncated = truncateToBcryptLimit(password);
+
+    expect(truncated).toBe('😀'.repeat(18));
+    expect(utf8Length(truncated)).toBe(BCRYPT_MAX_BYTES);
+  });
+});
+
+describe('verifyPassword', () => {
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  it('should accept the right password for a bcrypt hash and reject a wrong one', async () => {
+    // Low cost keeps the test fast; the cost is read from the hash itself
+    const stored = await bcrypt.hash('Correct-Pass1!', 4);
+
+    expect(await verifyPassword('Correct-Pass1!', stored)).toBe(true);
+    expect(await verifyPassword('Wrong-Pass1!', stored)).toBe(false);
+  });
+
+  it('should compare legacy plain-text passwords directly', async () => {
+    const compare = jest.spyOn(bcrypt, 'compare');
+
+    expect(await verifyPassword('legacy-password', 'legacy-password')).toBe(true);
+    expect(await verifyPassword('other-password', 'legacy-password')).toBe(false);
+    expect(compare).not.toHaveBeenCalled();
+  });
+
+  it('should still run a bcrypt comparison and return false when nothing is stored', async () => {
+    const compare = jest.spyOn(bcrypt, 'compare');
+
+    expect(await verifyPassword('Any-Pass1!', undefined)).toBe(false);
+    expect(await verifyPassword('Any-Pass1!', null)).toBe(false);
+    expect(compare).toHaveBeenCalledTimes(2);
+  });
+});
@@ -0,0 +1,114 @@
+import { describe, it, expect, beforeEach, afterEach } from '@jest/globals';
+import { PassThrough } from 'stream';
+import os from 'os';
+import path from 'path';
+import fs from 'fs/promises';
+import { createPDFDiskStorage, InvalidPDFUploadError } from '../../utils/pdfUploadStorage';
+import { hasPDFSignature } from '../../utils/pdfParser';
+
+interface HandleResult {
+  error: any;
+  info?: Partial<Express.Multer.File>;
+}
+
+/**
+ * Run _handleFile against a PassThrough, feeding it the given chunks
+ * `feed` receives the stream so tests can also end or destroy it themselves
+ */
+function handleUpload(
+  uploadDir: string,
+  feed: (stream: PassThrough) => void
+): Promise<HandleResult> {
+  const storage = createPDFDiskStorage(uploadDir, 'test');
+  const stream = new PassThrough();
+  const file = { originalname: 'statement.pdf', stream } as unknown as Express.Multer.File;
+
+  return new Promise((resolve) => {
+    storage._handleFile({} as any, file, (error, info) => resolve({ error, info }));
+    feed(stream);
+  });
+}
+
+describe('hasPDFSignature', () => {
+  it('should accept a header starting with %PDF-', () => {
+    expect(hasPDFSignature(Buffer.from('%PDF-1.7\n...'))).toBe(true);
+  });
+
+  it('should accept the header after leading bytes within the first 1KB', () => {
+    expect(hasPDFSignature(Buffer.concat([Buffer.alloc(100), Buffer.from('%PDF-1.4')]))).toBe(true);
+  });
+
+  it('should reject other content and empty buffers', () => {
+    expect(hasPDFSignature(Buffer.from('<html>not a pdf</html>'))).toBe(false);
+    expect(hasPDFSignature(Buffer.alloc(0))).toBe(false);
+  });
+});
+
+describe('createPDFDiskStorage', () => {
+  let uploadDir: string;
+
+  beforeEach(async () => {
+    uploadDir = await fs.mkdtemp(path.join(os.tmpdir(), 'rentease-upload-'));
+  });
+
+  afterEach(async () => {
+    await fs.rm(uploadDir, { recursive: true, force: true });
+  });
+
+  it('should reject non-PDF content without creating a file', async () => {
+    const { error, info } = await handleUpload(uploadDir, (stream) => {
+      stream.end(Buffer.alloc(4096, 'x'));
+    });
+
+    expect(error).toBeInstanceOf(InvalidPDFUploadError);
+    expect(info).toBeUndefined();
+    expect(await fs.readdir(uploadDir)).toEqual([]);
+  });
+
+  it('should reject an empty upload without creating a file', async () => {
+    const { error } = await handleUpload(uploadDir, (stream) => stream.end());
+
+    expect(error).toBeInstanceOf(InvalidPDFUploadError);
+    expect(await fs.readdir(uploadDir)).toEqual([]);
+  });
+
+  it('should save a PDF smaller than the sniff window that ends before the threshold', async () => {
+    const content = Buffer.from('%PDF-1.4\nsmall statement\n%%EOF');
+
+    const { error, info } = await handleUpload(uploadDir, (stream) => stream.end(content));
+
+    expect(error).toBeNull();
+    expect(info?.size).toBe(content.length);
+    expect(await fs.readFile(info!.path!)).toEqual(content);
+  });
+
+  it('should stream a PDF larger than the sniff window to disk intact', async () => {
+    const content = Buffer.concat([
+      Buffer.from('%PDF-1.7\n'),
+      Buffer.from(Array.from({ length: 200_000 }, (_, i) => i % 256)),
+    ]);
+
+    const { error, info } = await handleUpload(uploadDir, (stream) => {
+      // Uneven chunks so the 1KB threshold is crossed mid-chunk
+      stream.write(content.subarray(0, 700));
+      stream.write(content.subarray(700, 1500));
+      stream.end(content.subarray(1500));
+    });
+
+    expect(error).toBeNull();
+    expect(info?.size).toBe(content.length);
+    expect(await fs.readFile(info!.path!)).toEqual(content);
+  });
+
+  it('should remove the partial file when the upload stream fails mid-write', async () => {
+    const failure = new Error('connection reset');
+
+    const { error } = await handleUpload(uploadDir, (stream) => {
+      stream.write(Buffer.concat([Buffer.from('%PDF-1.7\n'), Buffer.alloc(2048)]));
+      setTimeout(() => stream.destroy(failure), 20);
+    });
+
+    expect(error).toBe(failure);
+    expect(await fs.readdir(uploadDir)).toEqual([]);
+  });
+});
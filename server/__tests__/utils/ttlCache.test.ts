@@ -0,0 +1,60 @@
+import { describe, it, expect, beforeEach, afterEach, jest } from '@jest/globals';
+import { TtlCache } from '../../utils/ttlCache';
+
+describe('TtlCache', () => {
+  let now: number;
+
+  beforeEach(() => {
+    now = 1_700_000_000_000;
+    jest.spyOn(Date, 'now').mockImplementation(() => now);
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  it('should return cached values before they expire', () => {
+    const cache = new TtlCache<string, number>(10, 1000);
+    cache.set('a', 1);
+
+    now += 999;
+
+    expect(cache.get('a')).toBe(1);
+  });
+
+  it('should expire values after the TTL', () => {
+    const cache = new TtlCache<string, number>(10, 1000);
+    cache.set('a', 1);
+
+    now += 1000;
+
+    expect(cache.get('a')).toBeUndefined();
+    expect(cache.size).toBe(0);
+  });
+
+  it('should evict the least recently used entry when full', () => {
+    const cache = new TtlCache<string, number>(2, 1000);
+    cache.set('a', 1);
+    cache.set('b', 2);
+
+    // Touch "a" so "b" becomes the least recently used
+    cache.get('a');
+    cache.set('c', 3);
+
+    expect(cache.get('a')).toBe(1);
+    expect(cache.get('b')).toBeUndefined();
+    expect(cache.get('c')).toBe(3);
+  });
+
+  it('should remove entries on delete and clear', () => {
+    const cache = new TtlCache<string, number>(10, 1000);
+    cache.set('a', 1);
+    cache.set('b', 2);
+
+    cache.delete('a');
+    expect(cache.get('a')).toBeUndefined();
+
+    cache.clear();
+    expect(cache.size).toBe(0);
+  });
+});
@@ -0,0 +1,50 @@
+/**
+ * bcrypt cost calibration
+ * Times a hash at each cost factor on the current machine so BCRYPT_COST can be
+ * set to the highest value that stays within the target latency.
+ *
+ * Usage: npm run calibrate:bcrypt [-- <targetMs>]
+ */
+
+import bcrypt from 'bcryptjs';
+
+const TARGET_MS = parseInt(process.argv[2] || '100', 10);
+const SAMPLES = 3;
+const SAMPLE_PASSWORD = 'Calibrate-Password-123!';
+const MIN_COST = 8;
+const MAX_COST = 14;
+
+async function timeHash(cost: number): Promise<number> {
+  let total = 0;
+  for (let i = 0; i < SAMPLES; i++) {
+    const start = process.hrtime.bigint();
+    await bcrypt.hash(SAMPLE_PASSWORD, cost);
+    total += Number(process.hrtime.bigint() - start) / 1e6;
+  }
+  return total / SAMPLES;
+}
+
+async function calibrate() {
+  console.log(`⏱️  Calibrating bcrypt cost (target ≈ ${TARGET_MS}ms per hash, ${SAMPLES} samples each)\n`);
+
+  // Never recommend less than MIN_COST, even on very slow hardware
+  let recommended = MIN_COST;
+  for (let cost = MIN_COST; cost <= MAX_COST; cost++) {
+    const ms = await timeHash(cost);
+    console.log(`  cost ${cost.toString().padStart(2)}: ${ms.toFixed(1)}ms`);
+
+    if (ms <= TARGET_MS) {
+      recommended = cost;
+    } else {
+      // Each further step doubles the time, no need to keep measuring
+      break;
+    }
+  }
+
+  console.log(`\n✅ Recommended: BCRYPT_COST=${recommended}`);
+}
+
+calibrate().catch((error) => {
+  console.error('❌ Calibration failed:', error);
+  process.exit(1);
+});
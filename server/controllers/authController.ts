@@ -10,7 +10,8 @@ import { ZodError } from "zod";
 import { logActivity, createActivityLog } from "./activityController";
 import { createUserSession, destroyUserSession } from "../middleware/auth";
 import { sendWelcomeEmail } from "../services/emailService";
-import bcrypt from 'bcryptjs';
+import { verifyPassword } from "../utils/password";
+import { ConflictError } from "../utils/errorHandler";
 
 export class AuthController {
   /**
@@ -20,13 +21,8 @@ export class AuthController {
   static async register(req: Request, res: Response) {
     try {
       const userData = insertUserSchema.parse(req.body);
-      
-      // Check if user already exists
-      const existingUser = await storage.getUserByEmail(userData.email);
-      if (existingUser) {
-        return res.status(409).json({ error: "User already exists with this email" });
-      }
 
+      // createUser enforces uniqueness and throws ConflictError on duplicates
       const user = await storage.createUser(userData);
       
       // CRITICAL: Create session immediately for newly registered user
@@ -113,6 +109,9 @@ export class AuthController {
       if (error instanceof ZodError) {
         return res.status(400).json({ error: "Invalid user data", details: error.errors });
       }
+      if (error instanceof ConflictError) {
+        return res.status(409).json({ error: error.message });
+      }
       console.error("Error creating user:", error);
       res.status(500).json({ error: "Failed to create user" });
     }
@@ -131,23 +130,13 @@ export class AuthController {
       }
 
       const user = await storage.getUserByEmail(email);
-        if (!user) {
-          return res.status(401).json({ error: "Invalid credentials" });
-        }
-        // Support both bcrypt-hashed and legacy plain-text passwords
-        let passwordMatches = false;
-        if (user.password) {
-          if (user.password.startsWith('$2a$') || user.password.startsWith('$2b$') || user.password.startsWith('$2y$')) {
-            // bcrypt hash
-            passwordMatches = await bcrypt.compare(password, user.password);
-          } else {
-            // legacy plain-text
-            passwordMatches = password === user.password;
-          }
-        }
-        if (!passwordMatches) {
-          return res.status(401).json({ error: "Invalid credentials" });
-        }
+      // getUserByEmail always queries the database (never cached) and one bcrypt
+      // comparison runs even for unknown emails, so known and unknown emails cost
+      // the same work and response time does not reveal whether an account exists
+      const passwordMatches = await verifyPassword(password, user?.password);
+      if (!user || !passwordMatches) {
+        return res.status(401).json({ error: "Invalid credentials" });
+      }
 
 
       // Create session
@@ -180,23 +169,13 @@ export class AuthController {
       }
 
       const user = await storage.getUserByEmail(email);
-        if (!user) {
-          return res.status(401).json({ error: "Invalid credentials" });
-        }
-        // Support both bcrypt-hashed and legacy plain-text passwords
-        let passwordMatches = false;
-        if (user.password) {
-          if (user.password.startsWith('$2a$') || user.password.startsWith('$2b$') || user.password.startsWith('$2y$')) {
-            // bcrypt hash
-            passwordMatches = await bcrypt.compare(password, user.password);
-          } else {
-            // legacy plain-text
-            passwordMatches = password === user.password;
-          }
-        }
-        if (!passwordMatches) {
-          return res.status(401).json({ error: "Invalid credentials" });
-        }
+      // getUserByEmail always queries the database (never cached) and one bcrypt
+      // comparison runs even for unknown emails, so known and unknown emails cost
+      // the same work and response time does not reveal whether an account exists
+      const passwordMatches = await verifyPassword(password, user?.password);
+      if (!user || !passwordMatches) {
+        return res.status(401).json({ error: "Invalid credentials" });
+      }
 
       // Create session
       createUserSession(req, user.id, user.role, rememberMe || false);
@@ -226,8 +205,8 @@ export class AuthController {
         return res.status(404).json({ error: "User not found" });
       }
 
-      const { password, ...userWithoutPassword } = user;
-      res.json(userWithoutPassword);
+      // getUser never includes the password hash
+      res.json(user);
     } catch (error) {
       console.error("Error getting user:", error);
       res.status(500).json({ error: "Failed to get user" });
@@ -269,9 +248,9 @@ export class AuthController {
       
       console.log('✅ Returning user session:', user.id, user.role);
 
-      const { password, ...userWithoutPassword } = user;
+      // getUser never includes the password hash
       res.json({
-        user: userWithoutPassword,
+        user,
         session: {
           createdAt: req.session.createdAt,
           rememberMe: req.session.rememberMe,
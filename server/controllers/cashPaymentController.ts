@@ -275,7 +275,7 @@ export class CashPaymentController {
           forYear,
           timestamp: new Date().toISOString(),
         },
-      });
+      }, 'landlord');
 
       // 4. Broadcast to TENANT
       broadcastToUser(tenantId, {
@@ -291,7 +291,7 @@ export class CashPaymentController {
           balance: expectedAmount - totalPaidNow,
           timestamp: new Date().toISOString(),
         },
-      });
+      }, 'tenant');
 
       console.log(`📡 WebSocket broadcasts sent to landlord (${landlordId}) and tenant (${tenantId})`);
       console.log(`🔔 Notifications logged for both landlord and tenant`);
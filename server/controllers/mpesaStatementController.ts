@@ -3,13 +3,14 @@
  * Handles PDF upload, parsing, and tenant matching
  */
 
-import type { Request, Response } from 'express';
+import type { Request, Response, NextFunction } from 'express';
 import mongoose from 'mongoose';
 import multer from 'multer';
 import path from 'path';
 import fs from 'fs/promises';
 import { Tenant, PaymentHistory, ActivityLog } from '../database';
 import { extractTextFromPDF, validatePDFFile } from '../utils/pdfParser';
+import { createPDFDiskStorage, InvalidPDFUploadError } from '../utils/pdfUploadStorage';
 import { parseStatementTransactions, getTransactionSummary } from '../utils/transactionParser';
 import { matchTransactionsToTenants, getMatchingStatistics, TenantInfo } from '../utils/tenantMatcher';
 import { broadcastToUser } from '../websocket';
@@ -86,34 +87,61 @@ const MpesaStatementUpload = mongoose.model('MpesaStatementUpload', MpesaStateme
 const MpesaTransactionMatch = mongoose.model('MpesaTransactionMatch', MpesaTransactionMatchSchema);
 
 // Configure multer for PDF upload
-const storage = multer.diskStorage({
-  destination: async (req, file, cb) => {
-    const uploadDir = path.join(process.cwd(), 'uploads', 'mpesa-statements');
-    await fs.mkdir(uploadDir, { recursive: true });
-    cb(null, uploadDir);
-  },
-  filename: (req, file, cb) => {
-    const uniqueSuffix = Date.now() + '-' + Math.round(Math.random() * 1E9);
-    cb(null, `mpesa-${uniqueSuffix}${path.extname(file.originalname)}`);
-  }
-});
+const UPLOAD_DIR = path.join(process.cwd(), 'uploads', 'mpesa-statements');
+
+// Sniffs the PDF header before writing, so non-PDF content never reaches disk
+const statementStorage = createPDFDiskStorage(UPLOAD_DIR, 'mpesa');
+
+const MAX_STATEMENT_BYTES = 10 * 1024 * 1024; // 10MB max
 
 const upload = multer({
-  storage,
+  storage: statementStorage,
   fileFilter: (req, file, cb) => {
+    // Don't write anything to disk for requests the handler will reject anyway
+    if (req.session?.userRole !== 'landlord') {
+      return cb(null, false);
+    }
+
     const isValid = validatePDFFile(file.originalname, file.mimetype);
     if (isValid) {
       cb(null, true);
     } else {
-      cb(new Error('Only PDF files are allowed'));
+      cb(new InvalidPDFUploadError());
     }
   },
   limits: {
-    fileSize: 10 * 1024 * 1024, // 10MB max
+    fileSize: MAX_STATEMENT_BYTES,
   }
 });
 
-export const uploadMiddleware = upload.single('statement');
+const uploadStatement = upload.single('statement');
+
+/**
+ * Statement upload middleware
+ * Multer errors are answered as JSON like every other API error, instead of
+ * falling through to Express's default HTML error page
+ */
+export function uploadMiddleware(req: Request, res: Response, next: NextFunction) {
+  uploadStatement(req, res, (error?: any) => {
+    if (!error) return next();
+
+    if (error instanceof InvalidPDFUploadError) {
+      return res.status(400).json({ error: error.message });
+    }
+
+    if (error instanceof multer.MulterError) {
+      if (error.code === 'LIMIT_FILE_SIZE') {
+        return res.status(413).json({
+          error: 'Payload too large',
+          message: 'Statement exceeds the maximum allowed size of 10MB',
+        });
+      }
+      return res.status(400).json({ error: error.message });
+    }
+
+    next(error);
+  });
+}
 
 /**
  * Upload and parse M-Pesa statement
@@ -587,7 +615,7 @@ export async function approveMatch(req: Request, res: Response) {
         receiptNumber: match.transaction.receiptNo,
         timestamp: new Date().toISOString(),
       },
-    });
+    }, 'landlord');
 
     // Broadcast to TENANT
     broadcastToUser(tenantId, {
@@ -604,7 +632,7 @@ export async function approveMatch(req: Request, res: Response) {
         receiptNumber: match.transaction.receiptNo,
         timestamp: new Date().toISOString(),
       },
-    });
+    }, 'tenant');
 
     console.log(`📡 WebSocket broadcasts sent to landlord and tenant`);
     console.log(`🔔 Notifications logged for both parties`);
@@ -338,7 +338,7 @@ export class TenantController {
             utilityCharges,
             totalUtilityCost
           }
-        });
+        }, 'landlord');
 
         // Broadcast to tenant
         broadcastToUser(tenantId, {
@@ -350,7 +350,7 @@ export class TenantController {
             utilityCharges,
             totalUtilityCost
           }
-        });
+        }, 'tenant');
       }
 
       res.json({
@@ -1,16 +1,39 @@
+import './env';
 import mongoose from 'mongoose';
-import dotenv from 'dotenv';
-
-// Only load .env file in development (Render injects env vars directly in production)
-if (process.env.NODE_ENV !== 'production') {
-  dotenv.config();
-}
 
 // Accept both MONGODB_URL and MONGODB_URI (Render uses MONGODB_URI by default)
 const MONGODB_URL = process.env.MONGODB_URL || process.env.MONGODB_URI;
 const MONGODB_LOCAL_URL = process.env.MONGODB_LOCAL_URL || 'mongodb://localhost:27017';
 const DATABASE_NAME = process.env.DATABASE_NAME || "RentFlow";
 
+const DEFAULT_MAX_POOL_SIZE = 10;
+const DEFAULT_MIN_POOL_SIZE = 2;
+
+/**
+ * Parse a pool size from the environment
+ * Anything but a non-negative integer (positive for the max) falls back to the default
+ */
+function parsePoolSize(name: string, value: string | undefined, fallback: number, min: number): number {
+  if (!value) return fallback;
+
+  const size = Number(value);
+  if (!Number.isInteger(size) || size < min) {
+    console.warn(`⚠️  Invalid ${name} "${value}", using default of ${fallback}`);
+    return fallback;
+  }
+
+  return size;
+}
+
+// Connection pool sizing. Warm sockets avoid a TCP/TLS handshake to Atlas per burst of
+// requests; the cap keeps schedulers and WebSocket-driven traffic from exhausting the cluster.
+const MAX_POOL_SIZE = parsePoolSize('MONGODB_MAX_POOL_SIZE', process.env.MONGODB_MAX_POOL_SIZE, DEFAULT_MAX_POOL_SIZE, 1);
+const REQUESTED_MIN_POOL_SIZE = parsePoolSize('MONGODB_MIN_POOL_SIZE', process.env.MONGODB_MIN_POOL_SIZE, DEFAULT_MIN_POOL_SIZE, 0);
+if (REQUESTED_MIN_POOL_SIZE > MAX_POOL_SIZE) {
+  console.warn(`⚠️  MONGODB_MIN_POOL_SIZE (${REQUESTED_MIN_POOL_SIZE}) exceeds MONGODB_MAX_POOL_SIZE, using ${MAX_POOL_SIZE}`);
+}
+const MIN_POOL_SIZE = Math.min(REQUESTED_MIN_POOL_SIZE, MAX_POOL_SIZE);
+
 if (!MONGODB_URL && !process.env.USE_LOCAL_DB) {
   console.error('❌ MongoDB connection string not found!');
   console.error('Available MongoDB env vars:', Object.keys(process.env).filter(k => k.includes('MONGO')));
@@ -19,6 +42,11 @@ if (!MONGODB_URL && !process.env.USE_LOCAL_DB) {
 }
 
 export async function connectToDatabase() {
+  // Reuse the existing connection when called again (scripts, tests)
+  if (mongoose.connection.readyState === 1) {
+    return;
+  }
+
   // Determine which MongoDB to use
   const useLocal = process.env.USE_LOCAL_DB === 'true';
   const connectionUrl = useLocal ? MONGODB_LOCAL_URL : MONGODB_URL!;
@@ -30,7 +58,9 @@ export async function connectToDatabase() {
       dbName: DATABASE_NAME,
       serverSelectionTimeoutMS: useLocal ? 5000 : 10000, // Shorter timeout for local
       socketTimeoutMS: useLocal ? 30000 : 45000,
-      maxPoolSize: 10, // Maintain up to 10 socket connections
+      maxPoolSize: MAX_POOL_SIZE, // Maintain up to MAX_POOL_SIZE socket connections (default 10)
+      minPoolSize: MIN_POOL_SIZE, // Keep a few sockets open between bursts (default 2)
+      maxIdleTimeMS: 5 * 60 * 1000, // Close sockets above minPoolSize after 5 idle minutes
     };
     
     // Only add these options for Atlas (not local MongoDB)
@@ -190,6 +220,11 @@ const tenantSchema = new mongoose.Schema({
   collection: 'tenants'
 });
 
+// Indexes for tenant lookups by landlord (tenant lists, statement matching, reminders)
+// and by property (property tenant lists)
+tenantSchema.index({ 'apartmentInfo.landlordId': 1 });
+tenantSchema.index({ 'apartmentInfo.propertyId': 1 });
+
 // Property Model (properties collection)
 const propertySchema = new mongoose.Schema({
   landlordId: { type: mongoose.Schema.Types.ObjectId, ref: 'Landlord', required: true },
@@ -209,12 +244,17 @@ const propertySchema = new mongoose.Schema({
   }],
   totalUnits: String,
   occupiedUnits: { type: String, default: '0' },
+  // Legacy, no longer written: tenants reference their property through
+  // apartmentInfo.propertyId (indexed), which keeps property documents bounded
   tenants: [{ type: mongoose.Schema.Types.ObjectId, ref: 'Tenant' }],
 }, {
   timestamps: true,
   collection: 'properties'
 });
 
+// Index for listing a landlord's properties
+propertySchema.index({ landlordId: 1 });
+
 // Payment History Model (payment_history collection)
 const paymentHistorySchema = new mongoose.Schema({
   tenantId: { type: mongoose.Schema.Types.ObjectId, ref: 'Tenant', required: true },
@@ -240,6 +280,13 @@ const paymentHistorySchema = new mongoose.Schema({
   collection: 'payment_history'
 });
 
+// Indexes for efficient querying of bills and payments
+paymentHistorySchema.index({ tenantId: 1, forYear: -1, forMonth: -1 }); // Tenant history, bill for a given month
+paymentHistorySchema.index({ tenantId: 1, status: 1 }); // Outstanding bills per tenant
+paymentHistorySchema.index({ landlordId: 1, paymentDate: -1 }); // Landlord payment history
+paymentHistorySchema.index({ propertyId: 1, paymentDate: -1 }); // Property payment history
+paymentHistorySchema.index({ status: 1 }); // Daily scan for pending bills
+
 // Activity Log Model (activity_logs collection)
 const activityLogSchema = new mongoose.Schema({
   landlordId: { type: mongoose.Schema.Types.ObjectId, ref: 'Landlord', required: true, index: true },
@@ -0,0 +1,13 @@
+/**
+ * Environment loading
+ * Import this module first so every other module sees .env values at import time.
+ * ES modules are evaluated once, so .env is parsed exactly once per process no
+ * matter how many modules import it.
+ */
+
+import dotenv from "dotenv";
+
+// Only load .env file in development (Render injects env vars directly in production)
+if (process.env.NODE_ENV !== 'production') {
+  dotenv.config();
+}
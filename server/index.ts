@@ -1,3 +1,4 @@
+import "./env";
 import express, { type Request, Response, NextFunction } from "express";
 import cors from "cors";
 import helmet from "helmet";
@@ -18,12 +19,6 @@ import {
   detectSuspiciousActivity,
   setSecurityHeaders,
 } from "./middleware/security";
-import dotenv from "dotenv";
-
-// Only load .env file in development (Render injects env vars directly in production)
-if (process.env.NODE_ENV !== 'production') {
-  dotenv.config();
-}
 
 const app = express();
 
@@ -83,12 +78,16 @@ app.get('/health', (req, res) => {
 app.use((req, res, next) => {
   const start = Date.now();
   const path = req.path;
-  let capturedJsonResponse: Record<string, any> | undefined = undefined;
-
-  const originalResJson = res.json;
-  res.json = function (bodyJson, ...args) {
-    capturedJsonResponse = bodyJson;
-    return originalResJson.apply(res, [bodyJson, ...args]);
+  let capturedJsonResponse: string | undefined = undefined;
+
+  // res.json serializes the body and passes the string on to res.send, so keep
+  // that string for the log line rather than stringifying every response twice
+  const originalResSend = res.send;
+  res.send = function (body, ...args) {
+    if (typeof body === "string" && res.get("Content-Type")?.includes("application/json")) {
+      capturedJsonResponse = body;
+    }
+    return originalResSend.apply(res, [body, ...args]);
   };
 
   res.on("finish", () => {
@@ -96,7 +95,7 @@ app.use((req, res, next) => {
     if (path.startsWith("/api")) {
       let logLine = `${req.method} ${path} ${res.statusCode} in ${duration}ms`;
       if (capturedJsonResponse) {
-        logLine += ` :: ${JSON.stringify(capturedJsonResponse)}`;
+        logLine += ` :: ${capturedJsonResponse}`;
       }
 
       if (logLine.length > 80) {
@@ -1,4 +1,4 @@
-import { PaymentHistory, Tenant as TenantModel } from "../database";
+import { PaymentHistory, Tenant as TenantModel, Property } from "../database";
 import { logTenantActivity, createTenantActivityLog } from "../controllers/tenantActivityController";
 
 /**
@@ -72,18 +72,25 @@ export class BillNotificationScheduler {
       
       console.log(`  Found ${pendingBills.length} pending bills to check`);
       
+      // Batch-load tenants (for logging) and properties (for grace period settings)
+      // with one $in query each instead of two lookups per bill
+      const tenantIds = Array.from(new Set(pendingBills.map(bill => bill.tenantId.toString())));
+      const propertyIds = Array.from(new Set(pendingBills.map(bill => bill.propertyId.toString())));
+      
+      const [tenants, properties] = await Promise.all([
+        TenantModel.find({ _id: { $in: tenantIds } }).select('fullName').lean(),
+        Property.find({ _id: { $in: propertyIds } }).select('rentSettings').lean(),
+      ]);
+      
+      const tenantsById = new Map(tenants.map(tenant => [tenant._id.toString(), tenant]));
+      const propertiesById = new Map(properties.map(property => [property._id.toString(), property]));
+      
       let overdueCount = 0;
       let finalNoticeCount = 0;
       
       for (const bill of pendingBills) {
-        // Get tenant for logging
-        const tenant = await TenantModel.findById(bill.tenantId).select('fullName').lean();
-        
-        // Get property for grace period settings
-        const { Property } = await import("../database");
-        const property = await Property.findById(bill.propertyId)
-          .select('rentSettings')
-          .lean();
+        const tenant = tenantsById.get(bill.tenantId.toString());
+        const property = propertiesById.get(bill.propertyId.toString());
         
         const gracePeriod = property?.rentSettings?.gracePeriodDays || 3;
         const dueDate = new Date(bill.paymentDate);
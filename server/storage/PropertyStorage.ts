@@ -1,17 +1,31 @@
 import { type Property, type InsertProperty, type TenantProperty } from "@shared/schema";
 import { Landlord as LandlordModel, Tenant as TenantModel, Property as PropertyModel } from "../database";
 import { logTenantActivity, createTenantActivityLog } from "../controllers/tenantActivityController";
+import { TtlCache } from "../utils/ttlCache";
 
 // Helper function to validate ObjectId format
 function isValidObjectId(id: string): boolean {
   return /^[0-9a-fA-F]{24}$/.test(id);
 }
 
+/**
+ * Cache for the unfiltered property list used by tenant onboarding
+ * Every signup page load asks for all properties, while the list only changes
+ * when a landlord adds or edits one. Those writes clear the cache; the TTL
+ * bounds staleness of derived fields such as occupiedUnits.
+ */
+const ALL_PROPERTIES_CACHE_TTL_MS = 60 * 1000;
+const ALL_PROPERTIES_KEY = 'all';
+const allPropertiesCache = new TtlCache<string, Property[]>(1, ALL_PROPERTIES_CACHE_TTL_MS);
+
+// Fields returned by property search (skips the embedded tenants array)
+const PROPERTY_SEARCH_FIELDS = 'landlordId name propertyTypes rentSettings utilities totalUnits occupiedUnits createdAt';
+
 /**
  * PropertyStorage - Handles all property-related database operations
  * Scope: Property CRUD, property search, property utilities management
  * Collections: Property, Landlord (for properties array)
- * Dependencies: TenantModel (for utility change notifications)
+ * Dependencies: TenantModel (property tenants are found via apartmentInfo.propertyId)
  */
 export class PropertyStorage {
   /**
@@ -25,7 +39,11 @@ export class PropertyStorage {
         return undefined;
       }
 
-      const property = await PropertyModel.findById(id).lean();
+      // Tenant IDs come from the tenants' own property reference (indexed)
+      const [property, tenants] = await Promise.all([
+        PropertyModel.findById(id).select('-tenants').lean(),
+        TenantModel.find({ 'apartmentInfo.propertyId': id }).select('_id').lean(),
+      ]);
       if (!property) return undefined;
 
       return {
@@ -39,7 +57,7 @@ export class PropertyStorage {
         occupiedUnits: property.occupiedUnits,
         createdAt: property.createdAt,
         updatedAt: property.updatedAt,
-        tenants: property.tenants?.map(id => id.toString()) || [],
+        tenants: tenants.map(tenant => tenant._id.toString()),
       };
     } catch (error) {
       console.error('Error getting property:', error);
@@ -59,7 +77,7 @@ export class PropertyStorage {
         return [];
       }
 
-      const properties = await PropertyModel.find({ landlordId }).lean();
+      const properties = await PropertyModel.find({ landlordId }).select('-tenants').lean();
       console.log(`📊 PropertyStorage: Found ${properties.length} properties for landlord ${landlordId}`);
       if (properties.length > 0) {
         console.log('Properties:', properties.map(p => ({ id: p._id, name: p.name, landlordId: p.landlordId })));
@@ -103,6 +121,7 @@ export class PropertyStorage {
       });
       const saved = await property.save();
       console.log('✅ PropertyStorage: Property created successfully:', saved._id.toString());
+      this.invalidateSearchCache();
 
       // Add property to landlord's properties array
       await LandlordModel.findByIdAndUpdate(
@@ -139,17 +158,18 @@ export class PropertyStorage {
       }
 
       // Get the old property to detect utility changes
-      const oldProperty = await PropertyModel.findById(id).lean();
+      const oldProperty = await PropertyModel.findById(id).select('utilities').lean();
 
       const updatedProperty = await PropertyModel.findByIdAndUpdate(
         id,
         updates,
         { new: true }
-      ).populate('tenants').lean();
+      ).select('-tenants').lean();
 
       if (!updatedProperty) {
         return undefined;
       }
+      this.invalidateSearchCache();
 
       // Detect if utilities were changed
       if (updates.utilities && oldProperty) {
@@ -159,55 +179,54 @@ export class PropertyStorage {
         // Check if utilities changed
         const utilitiesChanged = JSON.stringify(oldUtilities) !== JSON.stringify(newUtilities);
 
-        if (utilitiesChanged && updatedProperty.tenants && Array.isArray(updatedProperty.tenants)) {
-          console.log(`🔔 Utilities changed for property ${updatedProperty.name}, notifying ${updatedProperty.tenants.length} tenants`);
+        if (utilitiesChanged) {
+          // Tenants reference their property, so the indexed lookup finds them directly
+          const tenants = await TenantModel.find({ 'apartmentInfo.propertyId': id })
+            .select('fullName')
+            .lean();
+          console.log(`🔔 Utilities changed for property ${updatedProperty.name}, notifying ${tenants.length} tenants`);
+
+          // Create detailed utility change message (same for every tenant)
+          const utilityChanges: string[] = [];
+
+          // Check for new utilities
+          newUtilities.forEach((newUtil: any) => {
+            const oldUtil = oldUtilities.find((old: any) => old.type === newUtil.type);
+            if (!oldUtil) {
+              utilityChanges.push(`New utility added: ${newUtil.type} at KSH ${newUtil.price}/unit`);
+            } else if (oldUtil.price !== newUtil.price) {
+              utilityChanges.push(`${newUtil.type}: KSH ${oldUtil.price} → KSH ${newUtil.price} per unit`);
+            }
+          });
+
+          // Check for removed utilities
+          oldUtilities.forEach((oldUtil: any) => {
+            const stillExists = newUtilities.find((newUtil: any) => newUtil.type === oldUtil.type);
+            if (!stillExists) {
+              utilityChanges.push(`${oldUtil.type} utility removed`);
+            }
+          });
+
+          const changesText = utilityChanges.length > 0
+            ? utilityChanges.join('; ')
+            : 'Utility rates have been updated';
 
           // Notify all tenants in this property about utility changes
-          for (const tenant of updatedProperty.tenants) {
-            const tenantId = typeof tenant === 'object' && tenant._id ? tenant._id.toString() : tenant.toString();
-            const tenantDoc = await TenantModel.findById(tenantId);
-
-            if (tenantDoc) {
-              // Create detailed utility change message
-              const utilityChanges: string[] = [];
-
-              // Check for new utilities
-              newUtilities.forEach((newUtil: any) => {
-                const oldUtil = oldUtilities.find((old: any) => old.type === newUtil.type);
-                if (!oldUtil) {
-                  utilityChanges.push(`New utility added: ${newUtil.type} at KSH ${newUtil.price}/unit`);
-                } else if (oldUtil.price !== newUtil.price) {
-                  utilityChanges.push(`${newUtil.type}: KSH ${oldUtil.price} → KSH ${newUtil.price} per unit`);
-                }
-              });
-
-              // Check for removed utilities
-              oldUtilities.forEach((oldUtil: any) => {
-                const stillExists = newUtilities.find((newUtil: any) => newUtil.type === oldUtil.type);
-                if (!stillExists) {
-                  utilityChanges.push(`${oldUtil.type} utility removed`);
-                }
-              });
-
-              const changesText = utilityChanges.length > 0
-                ? utilityChanges.join('; ')
-                : 'Utility rates have been updated';
-
-              await logTenantActivity(createTenantActivityLog(
-                tenantId,
-                'system_alert',
-                'Utility Rates Updated',
-                `Your landlord has updated the utility rates for ${updatedProperty.name}. ${changesText}. Please check the "My Apartment" tab for current rates.`,
-                {
-                  landlordId: updatedProperty.landlordId.toString(),
-                  propertyId: updatedProperty._id.toString(),
-                  propertyName: updatedProperty.name,
-                },
-                'medium'
-              ));
-
-              console.log(`  ✓ Notified tenant ${tenantDoc.fullName} about utility changes`);
-            }
+          for (const tenantDoc of tenants) {
+            await logTenantActivity(createTenantActivityLog(
+              tenantDoc._id.toString(),
+              'system_alert',
+              'Utility Rates Updated',
+              `Your landlord has updated the utility rates for ${updatedProperty.name}. ${changesText}. Please check the "My Apartment" tab for current rates.`,
+              {
+                landlordId: updatedProperty.landlordId.toString(),
+                propertyId: updatedProperty._id.toString(),
+                propertyName: updatedProperty.name,
+              },
+              'medium'
+            ));
+
+            console.log(`  ✓ Notified tenant ${tenantDoc.fullName} about utility changes`);
           }
         }
       }
@@ -231,15 +250,20 @@ export class PropertyStorage {
 
   /**
    * Search properties by name
-   * Case-insensitive regex search
+   * Case-insensitive regex search; the unfiltered list is served from cache
    */
   async searchPropertiesByName(name: string): Promise<Property[]> {
     try {
+      if (!name) {
+        const cached = allPropertiesCache.get(ALL_PROPERTIES_KEY);
+        if (cached) return cached;
+      }
+
       // If no search term provided, return all properties
       const query = name ? { name: { $regex: name, $options: 'i' } } : {};
-      const properties = await PropertyModel.find(query).lean();
+      const properties = await PropertyModel.find(query).select(PROPERTY_SEARCH_FIELDS).lean();
 
-      return properties.map(property => ({
+      const results = properties.map(property => ({
         id: property._id.toString(),
         landlordId: property.landlordId.toString(),
         name: property.name,
@@ -250,12 +274,25 @@ export class PropertyStorage {
         occupiedUnits: property.occupiedUnits || "0",
         createdAt: property.createdAt,
       }));
+
+      if (!name) {
+        allPropertiesCache.set(ALL_PROPERTIES_KEY, results);
+      }
+
+      return results;
     } catch (error) {
       console.error('Error searching properties:', error);
       return [];
     }
   }
 
+  /**
+   * Drop the cached property list after a property is created or changed
+   */
+  invalidateSearchCache(): void {
+    allPropertiesCache.clear();
+  }
+
   /**
    * Get tenant property details
    * Returns both property and tenant apartment info
@@ -270,7 +307,7 @@ export class PropertyStorage {
         return undefined;
       }
 
-      const tenant = await TenantModel.findById(tenantId).lean();
+      const tenant = await TenantModel.findById(tenantId).select('apartmentInfo createdAt').lean();
       console.log('Found tenant:', tenant);
 
       if (!tenant || !tenant.apartmentInfo) {
@@ -1,5 +1,6 @@
 import { type RentStatus } from "@shared/schema";
 import { Tenant as TenantModel, Property as PropertyModel, PaymentHistory as PaymentHistoryModel } from "../database";
+import { propertyStorage } from "./PropertyStorage";
 
 /**
  * RentCycleStorage - Handles rent cycle calculations and updates
@@ -196,6 +197,9 @@ export class RentCycleStorage {
         },
         { new: true }
       );
+      if (result) {
+        propertyStorage.invalidateSearchCache();
+      }
 
       return !!result;
     } catch (error) {
@@ -1,12 +1,16 @@
 import { type Tenant, type InsertTenant } from "@shared/schema";
 import { Landlord as LandlordModel, Tenant as TenantModel, Property as PropertyModel, PaymentHistory as PaymentHistoryModel, ActivityLog as ActivityLogModel, TenantActivityLog as TenantActivityLogModel } from "../database";
 import { ObjectId } from "mongodb";
+import { userStorage } from "./UserStorage";
 
 // Helper function to validate ObjectId format
 function isValidObjectId(id: string): boolean {
   return /^[0-9a-fA-F]{24}$/.test(id);
 }
 
+// Fields needed to render tenant lists - never ship password hashes to list views
+const TENANT_LIST_FIELDS = 'fullName email phone status apartmentInfo rentCycle createdAt';
+
 /**
  * TenantStorage - Handles all tenant-related database operations
  * Scope: Tenant CRUD, tenant queries, cascade delete, landlord settings
@@ -114,6 +118,8 @@ export class TenantStorage {
         return undefined;
       }
 
+      userStorage.invalidateCachedUser(tenantId);
+
       return {
         _id: updatedTenant._id.toString(),
         fullName: updatedTenant.fullName,
@@ -146,11 +152,11 @@ export class TenantStorage {
   async getTenantsByProperty(propertyId: string): Promise<any[]> {
     try {
       // Get the property first to get rent settings
-      const property = await PropertyModel.findById(propertyId).lean();
+      const property = await PropertyModel.findById(propertyId).select('rentSettings').lean();
 
       const tenants = await TenantModel.find({
         'apartmentInfo.propertyId': propertyId
-      }).lean();
+      }).select(TENANT_LIST_FIELDS).lean();
 
       // Use the helper method for consistent rent cycle calculation
       const tenantsWithRentCycle = await Promise.all(tenants.map(async (tenant) => {
@@ -193,7 +199,10 @@ export class TenantStorage {
       // Find all tenants associated with this landlord
       const tenants = await TenantModel.find({
         'apartmentInfo.landlordId': landlordObjectId
-      }).populate('apartmentInfo.propertyId').lean();
+      })
+        .select(TENANT_LIST_FIELDS)
+        .populate('apartmentInfo.propertyId', 'name rentSettings')
+        .lean();
 
       console.log(`Finding tenants for landlordId: ${landlordObjectId}, found ${tenants.length} tenants`);
 
@@ -204,17 +213,11 @@ export class TenantStorage {
         console.log(`🔄 Processing rent cycle for tenant: ${tenant.fullName} (${tenant._id})`);
 
         try {
-          // Get the property to access rent settings
-          const propertyId = tenant.apartmentInfo?.propertyId;
-          console.log(`  📍 Property ID: ${propertyId}`);
-
-          if (propertyId) {
-            // Convert propertyId to string if it's an ObjectId
-            const propertyIdString = propertyId._id ? propertyId._id.toString() : propertyId.toString();
-            console.log(`  🔗 Property ID string: ${propertyIdString}`);
-
-            const property = await PropertyModel.findById(propertyIdString).lean();
+          // The property was already loaded by populate() above, so reuse it
+          // instead of issuing another findById per tenant
+          const property = tenant.apartmentInfo?.propertyId;
 
+          if (property) {
             // Use the centralized helper method for rent cycle calculation
             rentCycle = await this.getRentCycleForTenant(tenant, property);
           }
@@ -268,7 +271,7 @@ export class TenantStorage {
       const tenantName = tenant.fullName || tenant.email;
       console.log(`👤 Deleting tenant: ${tenantName}`);
 
-      // 1. Remove tenant from their property's tenant array
+      // 1. Remove tenant from their property's legacy tenants array (older records)
       if (tenant.apartmentInfo?.propertyId) {
         console.log(`📍 Removing tenant from property: ${tenant.apartmentInfo.propertyId}`);
         await PropertyModel.updateOne(
@@ -293,6 +296,7 @@ export class TenantStorage {
 
       // 5. Delete the tenant document (includes login credentials: email/password)
       const tenantDeleteResult = await TenantModel.deleteOne({ _id: tenantId });
+      userStorage.invalidateCachedUser(tenantId);
       console.log(`🏠 Deleted tenant record: ${tenantDeleteResult.deletedCount > 0 ? 'Success' : 'Failed'}`);
 
       const success = tenantDeleteResult.deletedCount === 1;
@@ -396,6 +400,8 @@ export class TenantStorage {
         throw new Error('Landlord not found');
       }
 
+      userStorage.invalidateCachedUser(landlordId);
+
       console.log('✅ Landlord settings updated successfully');
       return this.getLandlordSettings(landlordId);
     } catch (error) {
@@ -449,12 +455,6 @@ export class TenantStorage {
         { new: true }
       );
 
-      // Add tenant to property's tenants array
-      await PropertyModel.findByIdAndUpdate(
-        insertTenantProperty.propertyId,
-        { $push: { tenants: insertTenantProperty.tenantId } }
-      );
-
       if (!tenant) throw new Error('Tenant not found');
 
       return {
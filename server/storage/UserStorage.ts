@@ -1,12 +1,78 @@
 import { type User, type InsertUser } from "@shared/schema";
 import { Landlord as LandlordModel, Tenant as TenantModel } from "../database";
-import bcrypt from 'bcryptjs';
+import { hashPassword, verifyPassword } from "../utils/password";
+import { TtlCache } from "../utils/ttlCache";
+import { ConflictError } from "../utils/errorHandler";
+
+// User as returned by getUser: sessions and profile lookups never need the hash
+export type UserProfile = Omit<User, 'password'>;
 
 // Helper function to validate ObjectId format
 function isValidObjectId(id: string): boolean {
   return /^[0-9a-fA-F]{24}$/.test(id);
 }
 
+/**
+ * User lookup cache
+ * getUser runs on every session check for data that rarely changes. Entries live
+ * for a minute and are dropped whenever a user's credentials or profile are written
+ * (see invalidateCachedUser). Misses are never cached so a freshly registered user
+ * is visible immediately. Sign-in (getUserByEmail) always reads the database.
+ */
+const USER_CACHE_TTL_MS = 60 * 1000;
+const USER_CACHE_MAX_ENTRIES = 10_000;
+const usersById = new TtlCache<string, UserProfile>(USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_MS);
+
+// Bumped on every invalidation. A read that started before an invalidation may
+// have fetched the old document, so its result is returned but not cached.
+let cacheGeneration = 0;
+
+// Only the fields a User is built from. Landlord documents also carry Daraja
+// credentials, email templates and the properties array, none of which auth needs.
+// getUser (cached) leaves out the password hash; only sign-in reads it.
+const USER_PROFILE_FIELDS = 'fullName email createdAt';
+const USER_FIELDS = `${USER_PROFILE_FIELDS} password`;
+
+// Fields of a landlord or tenant document that a User is built from
+interface UserProfileDocument {
+  _id: { toString(): string };
+  fullName: string;
+  email: string;
+  createdAt?: Date;
+}
+
+interface UserDocument extends UserProfileDocument {
+  password: string;
+}
+
+/**
+ * Build a UserProfile from a landlord or tenant document
+ * The one construction path, so every user object (cached or not) has the same shape
+ */
+function toUserProfile(doc: UserProfileDocument, role: User['role']): UserProfile {
+  return {
+    id: doc._id.toString(),
+    fullName: doc.fullName,
+    email: doc.email,
+    role,
+    createdAt: doc.createdAt,
+  };
+}
+
+function toUser(doc: UserDocument, role: User['role']): User {
+  return { ...toUserProfile(doc, role), password: doc.password };
+}
+
+/**
+ * Pick the matching document from a parallel landlord/tenant lookup
+ * Landlords take precedence when both match
+ */
+function resolveRole<T>(landlord: T | null, tenant: T | null): [T, User['role']] | undefined {
+  if (landlord) return [landlord, 'landlord'];
+  if (tenant) return [tenant, 'tenant'];
+  return undefined;
+}
+
 /**
  * UserStorage - Handles all user-related database operations
  * Scope: User creation, authentication, password management
@@ -15,9 +81,10 @@ function isValidObjectId(id: string): boolean {
 export class UserStorage {
   /**
    * Get user by ID
-   * Searches in both landlords and tenants collections
+   * Searches landlords and tenants collections in parallel
+   * Returns the user without the password hash
    */
-  async getUser(id: string): Promise<User | undefined> {
+  async getUser(id: string): Promise<UserProfile | undefined> {
     try {
       // Validate ObjectId format
       if (!isValidObjectId(id)) {
@@ -25,33 +92,26 @@ export class UserStorage {
         return undefined;
       }
 
-      // Try to find in landlords collection first
-      const landlord = await LandlordModel.findById(id).lean();
-      if (landlord) {
-        return {
-          id: landlord._id.toString(),
-          fullName: landlord.fullName,
-          email: landlord.email,
-          password: landlord.password,
-          role: 'landlord' as const,
-          createdAt: landlord.createdAt,
-        };
-      }
+      const cached = usersById.get(id);
+      if (cached) return cached;
 
-      // Try to find in tenants collection
-      const tenant = await TenantModel.findById(id).lean();
-      if (tenant) {
-        return {
-          id: tenant._id.toString(),
-          fullName: tenant.fullName,
-          email: tenant.email,
-          password: tenant.password,
-          role: 'tenant' as const,
-          createdAt: tenant.createdAt,
-        };
-      }
+      const generation = cacheGeneration;
 
-      return undefined;
+      // Query both collections concurrently - one round-trip of latency instead of two
+      const [landlord, tenant] = await Promise.all([
+        LandlordModel.findById(id).select(USER_PROFILE_FIELDS).lean(),
+        TenantModel.findById(id).select(USER_PROFILE_FIELDS).lean(),
+      ]);
+
+      const match = resolveRole(landlord, tenant);
+      if (!match) return undefined;
+
+      const user = toUserProfile(...match);
+      // Don't cache a document that may predate a write made during the read
+      if (generation === cacheGeneration) {
+        usersById.set(user.id, user);
+      }
+      return user;
     } catch (error) {
       console.error('Error getting user by ID:', error);
       return undefined;
@@ -60,37 +120,20 @@ export class UserStorage {
 
   /**
    * Get user by email
-   * Searches in both landlords and tenants collections
+   * Searches landlords and tenants collections in parallel
+   * Never cached: sign-in must see the current password hash, and known and
+   * unknown emails must cost the same database work
    */
   async getUserByEmail(email: string): Promise<User | undefined> {
     try {
-      // Try to find in landlords collection first
-      const landlord = await LandlordModel.findOne({ email }).lean();
-      if (landlord) {
-        return {
-          id: landlord._id.toString(),
-          fullName: landlord.fullName,
-          email: landlord.email,
-          password: landlord.password,
-          role: 'landlord' as const,
-          createdAt: landlord.createdAt,
-        };
-      }
+      // Query both collections concurrently - one round-trip of latency instead of two
+      const [landlord, tenant] = await Promise.all([
+        LandlordModel.findOne({ email }).select(USER_FIELDS).lean(),
+        TenantModel.findOne({ email }).select(USER_FIELDS).lean(),
+      ]);
 
-      // Try to find in tenants collection
-      const tenant = await TenantModel.findOne({ email }).lean();
-      if (tenant) {
-        return {
-          id: tenant._id.toString(),
-          fullName: tenant.fullName,
-          email: tenant.email,
-          password: tenant.password,
-          role: 'tenant' as const,
-          createdAt: tenant.createdAt,
-        };
-      }
-
-      return undefined;
+      const match = resolveRole(landlord, tenant);
+      return match ? toUser(...match) : undefined;
     } catch (error) {
       console.error('Error getting user by email:', error);
       return undefined;
@@ -100,11 +143,22 @@ export class UserStorage {
   /**
    * Create new user (landlord or tenant)
    * Hashes password before saving
+   * Throws ConflictError if the email (or phone) is already registered
    */
   async createUser(insertUser: InsertUser): Promise<User> {
     try {
+      // Duplicates within the target collection are rejected by its unique indexes on
+      // insert (no read-then-write race). Only the other collection needs a lookup,
+      // since an email must not be registered as both a landlord and a tenant.
+      const emailTakenByOtherRole = insertUser.role === 'landlord'
+        ? await TenantModel.exists({ email: insertUser.email })
+        : await LandlordModel.exists({ email: insertUser.email });
+      if (emailTakenByOtherRole) {
+        throw new ConflictError("User already exists with this email");
+      }
+
       // Hash password before saving
-      const hashedPassword = await bcrypt.hash(insertUser.password, 10);
+      const hashedPassword = await hashPassword(insertUser.password);
       
       if (insertUser.role === 'landlord') {
         const landlord = new LandlordModel({
@@ -115,14 +169,7 @@ export class UserStorage {
           role: 'landlord',
         });
         const saved = await landlord.save();
-        return {
-          id: saved._id.toString(),
-          fullName: saved.fullName,
-          email: saved.email,
-          password: saved.password,
-          role: 'landlord' as const,
-          createdAt: saved.createdAt,
-        };
+        return toUser(saved, 'landlord');
       } else {
         const tenant = new TenantModel({
           fullName: insertUser.fullName,
@@ -132,24 +179,28 @@ export class UserStorage {
           role: 'tenant',
         });
         const saved = await tenant.save();
-        return {
-          id: saved._id.toString(),
-          fullName: saved.fullName,
-          email: saved.email,
-          password: saved.password,
-          role: 'tenant' as const,
-          createdAt: saved.createdAt,
-        };
+        return toUser(saved, 'tenant');
+      }
+    } catch (error: any) {
+      // Unique index violation (E11000) on email or phone
+      if (error?.code === 11000) {
+        const field = Object.keys(error.keyPattern || {})[0];
+        throw new ConflictError(
+          field === 'phone'
+            ? "User already exists with this phone number"
+            : "User already exists with this email"
+        );
+      }
+      if (!(error instanceof ConflictError)) {
+        console.error('Error creating user:', error);
       }
-    } catch (error) {
-      console.error('Error creating user:', error);
       throw error;
     }
   }
 
   /**
    * Change landlord password
-   * Verifies current password before updating
+   * Verifies current password before updating, stores the new one hashed
    */
   async changeLandlordPassword(
     landlordId: string,
@@ -160,27 +211,29 @@ export class UserStorage {
       console.log('🔐 Attempting to change password for landlord:', landlordId);
 
       // Verify the current password
-      const landlord = await LandlordModel.findById(landlordId);
+      const landlord = await LandlordModel.findById(landlordId).select('password');
       if (!landlord) {
         console.log('❌ Landlord not found');
         return false;
       }
 
       console.log('🔍 Verifying current password...');
-      if (landlord.password !== currentPassword) {
+      if (!(await verifyPassword(currentPassword, landlord.password))) {
         console.log('❌ Current password is incorrect');
         return false;
       }
 
       // Update with new password
       console.log('✅ Current password verified, updating to new password...');
-      const result = await LandlordModel.findByIdAndUpdate(
-        landlordId,
-        { $set: { password: newPassword } },
-        { new: true }
+      const hashedPassword = await hashPassword(newPassword);
+      // Write-only update: nothing from the saved document is needed back
+      const result = await LandlordModel.updateOne(
+        { _id: landlordId },
+        { $set: { password: hashedPassword } }
       );
 
-      if (result) {
+      if (result.matchedCount > 0) {
+        this.invalidateCachedUser(landlordId);
         console.log('✅ Password changed successfully');
         return true;
       }
@@ -195,7 +248,7 @@ export class UserStorage {
 
   /**
    * Change tenant password
-   * Verifies current password before updating
+   * Verifies current password before updating, stores the new one hashed
    */
   async changeTenantPassword(
     tenantId: string,
@@ -206,27 +259,29 @@ export class UserStorage {
       console.log('🔐 Attempting to change password for tenant:', tenantId);
 
       // Verify the current password
-      const tenant = await TenantModel.findById(tenantId);
+      const tenant = await TenantModel.findById(tenantId).select('password');
       if (!tenant) {
         console.log('❌ Tenant not found');
         return false;
       }
 
       console.log('🔍 Verifying current password...');
-      if (tenant.password !== currentPassword) {
+      if (!(await verifyPassword(currentPassword, tenant.password))) {
         console.log('❌ Current password is incorrect');
         return false;
       }
 
       // Update with new password
       console.log('✅ Current password verified, updating to new password...');
-      const result = await TenantModel.findByIdAndUpdate(
-        tenantId,
-        { $set: { password: newPassword } },
-        { new: true }
+      const hashedPassword = await hashPassword(newPassword);
+      // Write-only update: nothing from the saved document is needed back
+      const result = await TenantModel.updateOne(
+        { _id: tenantId },
+        { $set: { password: hashedPassword } }
       );
 
-      if (result) {
+      if (result.matchedCount > 0) {
+        this.invalidateCachedUser(tenantId);
         console.log('✅ Password changed successfully');
         return true;
       }
@@ -239,6 +294,15 @@ export class UserStorage {
     }
   }
 
+  /**
+   * Drop a user from the lookup cache
+   * Must be called after any write to a user's email, name or password, or on delete
+   */
+  invalidateCachedUser(userId: string): void {
+    cacheGeneration++;
+    usersById.delete(userId);
+  }
+
   /**
    * Get complete landlord details with properties and tenants
    * Returns landlord info with populated properties array
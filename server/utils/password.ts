@@ -0,0 +1,115 @@
+/**
+ * Password hashing utilities
+ * Single place that decides how passwords are hashed and verified with bcrypt
+ *
+ * Only the async bcryptjs API is used here: it runs the key schedule in small
+ * chunks and yields to the event loop between them, so a login or password change
+ * in flight never stalls other HTTP requests or WebSocket traffic. Do not use the
+ * *Sync variants on request paths.
+ */
+
+import bcrypt from 'bcryptjs';
+
+const DEFAULT_BCRYPT_COST = 10;
+
+/**
+ * Parse BCRYPT_COST from the environment
+ * bcrypt accepts 4-31; anything else falls back to the default
+ */
+function parseBcryptCost(value: string | undefined): number {
+  if (!value) return DEFAULT_BCRYPT_COST;
+
+  const cost = parseInt(value, 10);
+  if (!Number.isInteger(cost) || cost < 4 || cost > 31) {
+    console.warn(`⚠️  Invalid BCRYPT_COST "${value}", using default of ${DEFAULT_BCRYPT_COST}`);
+    return DEFAULT_BCRYPT_COST;
+  }
+
+  return cost;
+}
+
+/**
+ * bcrypt cost factor (log2 of the number of rounds)
+ * Every +1 doubles the time per hash. Calibrate on the deployment host with
+ * `npm run calibrate:bcrypt` and pick the highest cost that stays around 100ms.
+ * Raising it later is safe: existing hashes embed their own cost and still verify,
+ * and can be re-hashed at the new cost the next time the user signs in.
+ */
+export const BCRYPT_COST = parseBcryptCost(process.env.BCRYPT_COST);
+
+/**
+ * bcrypt only uses the first 72 bytes of the UTF-8 encoded password
+ */
+export const BCRYPT_MAX_BYTES = 72;
+
+/**
+ * Trim a password to the part bcrypt actually reads
+ * Stops at the first code point that reaches 72 UTF-8 bytes and keeps it whole,
+ * so bcrypt sees exactly the same first 72 bytes as for the full string and
+ * existing hashes still verify. Avoids encoding arbitrarily long inputs on every
+ * hash/compare call.
+ */
+export function truncateToBcryptLimit(plainPassword: string): string {
+  // Every UTF-16 code unit is at most 3 UTF-8 bytes, so short strings fit as-is
+  if (plainPassword.length * 3 <= BCRYPT_MAX_BYTES) return plainPassword;
+
+  let bytes = 0;
+  let end = 0;
+  for (const char of plainPassword) {
+    const codePoint = char.codePointAt(0)!;
+    bytes += codePoint < 0x80 ? 1 : codePoint < 0x800 ? 2 : codePoint < 0x10000 ? 3 : 4;
+    end += char.length;
+    if (bytes >= BCRYPT_MAX_BYTES) break;
+  }
+
+  return plainPassword.slice(0, end);
+}
+
+/**
+ * Hash a plain-text password with the configured cost factor
+ */
+export async function hashPassword(plainPassword: string): Promise<string> {
+  return bcrypt.hash(truncateToBcryptLimit(plainPassword), BCRYPT_COST);
+}
+
+/**
+ * Hash compared against when there is no stored password (unknown email),
+ * so a failed lookup costs the same bcrypt work as a wrong password and
+ * response timing does not reveal which emails are registered.
+ * Generated once on first use and reused, never per request.
+ */
+let dummyHash: Promise<string> | null = null;
+
+function getDummyHash(): Promise<string> {
+  if (!dummyHash) {
+    dummyHash = bcrypt.hash('rentease-timing-equalizer', BCRYPT_COST);
+  }
+  return dummyHash;
+}
+
+/**
+ * Check whether a stored password is a bcrypt hash ($2a$, $2b$ or $2y$)
+ */
+export function isBcryptHash(storedPassword: string): boolean {
+  return /^\$2[aby]\$/.test(storedPassword);
+}
+
+/**
+ * Verify a plain-text password against the stored value
+ * Supports both bcrypt hashes and legacy plain-text passwords.
+ * Pass undefined when the user was not found: a dummy comparison still runs
+ * so the call takes as long as a real one, and false is returned.
+ */
+export async function verifyPassword(plainPassword: string, storedPassword: string | undefined | null): Promise<boolean> {
+  if (!storedPassword) {
+    await bcrypt.compare(truncateToBcryptLimit(plainPassword), await getDummyHash());
+    return false;
+  }
+
+  if (isBcryptHash(storedPassword)) {
+    return bcrypt.compare(truncateToBcryptLimit(plainPassword), storedPassword);
+  }
+
+  // Legacy plain-text password
+  return plainPassword === storedPassword;
+}
@@ -86,6 +86,19 @@ export function validatePDFFile(filename: string, mimetype: string): boolean {
   return isPDF;
 }
 
+// Every PDF starts with this header; readers accept it anywhere in the first 1KB
+const PDF_SIGNATURE = Buffer.from('%PDF-');
+export const PDF_SIGNATURE_SEARCH_BYTES = 1024;
+
+/**
+ * Check that the start of a file really is a PDF
+ * Filename and mimetype are client-supplied, so the content itself is sniffed
+ * before the upload is written to disk or handed to the parser
+ */
+export function hasPDFSignature(header: Buffer): boolean {
+  return header.subarray(0, PDF_SIGNATURE_SEARCH_BYTES).includes(PDF_SIGNATURE);
+}
+
 /**
  * Get basic PDF metadata
  */
@@ -0,0 +1,114 @@
+/**
+ * PDF upload storage
+ * Multer storage engine that checks the PDF header before writing anything.
+ * The first 1KB of the upload is held in memory and sniffed for %PDF-; other
+ * content is rejected without reaching disk. Valid files are streamed to disk,
+ * and a file that fails part-way is removed before multer is told.
+ */
+
+import fs from 'fs/promises';
+import { createWriteStream, type WriteStream } from 'fs';
+import path from 'path';
+import type multer from 'multer';
+import { hasPDFSignature, PDF_SIGNATURE_SEARCH_BYTES } from './pdfParser';
+
+/**
+ * Upload rejected because it is not a PDF (by name/mimetype or by content)
+ */
+export class InvalidPDFUploadError extends Error {
+  constructor(message: string = 'Only PDF files are allowed') {
+    super(message);
+    this.name = 'InvalidPDFUploadError';
+    Object.setPrototypeOf(this, InvalidPDFUploadError.prototype);
+  }
+}
+
+/**
+ * Create a storage engine writing sniffed PDFs to `uploadDir` as `<prefix>-<unique>.<ext>`
+ */
+export function createPDFDiskStorage(uploadDir: string, filePrefix: string): multer.StorageEngine {
+  return {
+    _handleFile(req, file, cb) {
+      const headerChunks: Buffer[] = [];
+      let headerLength = 0;
+      let sniffed = false;
+      let failing = false;
+      let done = false;
+      let out: WriteStream | undefined;
+      let filePath: string | undefined;
+
+      const finish = (error: any, info?: Partial<Express.Multer.File>) => {
+        if (done) return;
+        done = true;
+        cb(error, info);
+      };
+
+      // Close and delete a partially written file, then report the error
+      const fail = (error: any) => {
+        if (done || failing) return;
+        failing = true;
+        if (!out || !filePath) return finish(error);
+
+        const partialPath = filePath;
+        out.once('close', () => {
+          fs.unlink(partialPath).catch(() => {}).finally(() => finish(error));
+        });
+        out.destroy();
+        out = undefined;
+      };
+
+      const writeToDisk = async (header: Buffer, ended: boolean) => {
+        await fs.mkdir(uploadDir, { recursive: true });
+        if (done) return; // Source failed while the directory was being created
+        const uniqueSuffix = Date.now() + '-' + Math.round(Math.random() * 1E9);
+        const filename = `${filePrefix}-${uniqueSuffix}${path.extname(file.originalname)}`;
+        filePath = path.join(uploadDir, filename);
+
+        const stream = createWriteStream(filePath);
+        out = stream;
+        stream.once('error', fail);
+        stream.once('finish', () => {
+          finish(null, { destination: uploadDir, filename, path: filePath, size: stream.bytesWritten });
+        });
+
+        stream.write(header);
+        if (ended) {
+          stream.end();
+        } else {
+          file.stream.pipe(stream);
+        }
+      };
+
+      const sniff = (ended: boolean) => {
+        if (sniffed) return;
+        sniffed = true;
+        file.stream.pause();
+        file.stream.off('data', onData);
+        file.stream.off('end', onEnd);
+
+        const header = Buffer.concat(headerChunks, headerLength);
+        if (!hasPDFSignature(header)) {
+          file.stream.resume(); // Drain the rest so the request can complete
+          return finish(new InvalidPDFUploadError());
+        }
+
+        writeToDisk(header, ended).catch(fail);
+      };
+
+      const onData = (chunk: Buffer) => {
+        headerChunks.push(chunk);
+        headerLength += chunk.length;
+        if (headerLength >= PDF_SIGNATURE_SEARCH_BYTES) sniff(false);
+      };
+      const onEnd = () => sniff(true);
+
+      file.stream.on('data', onData);
+      file.stream.once('end', onEnd);
+      file.stream.once('error', fail);
+    },
+
+    _removeFile(req, file, cb) {
+      fs.unlink(file.path).then(() => cb(null), cb);
+    },
+  };
+}
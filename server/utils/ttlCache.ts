@@ -0,0 +1,67 @@
+/**
+ * In-process TTL + LRU cache
+ * Small bounded cache for hot, rarely-changing lookups (users, public listings).
+ * Entries expire after `ttlMs`; when `maxEntries` is reached the least recently
+ * used entry is evicted. Relies on Map preserving insertion order.
+ */
+
+interface CacheEntry<V> {
+  value: V;
+  expiresAt: number; // Timestamp in milliseconds
+}
+
+export class TtlCache<K, V> {
+  private entries = new Map<K, CacheEntry<V>>();
+
+  constructor(
+    private readonly maxEntries: number,
+    private readonly ttlMs: number
+  ) {}
+
+  /**
+   * Get a value, or undefined if missing or expired
+   * A hit marks the entry as most recently used
+   */
+  get(key: K): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) return undefined;
+
+    if (entry.expiresAt <= Date.now()) {
+      this.entries.delete(key);
+      return undefined;
+    }
+
+    // Re-insert to move the key to the most recently used position
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry.value;
+  }
+
+  /**
+   * Store a value, evicting the least recently used entry if full
+   */
+  set(key: K, value: V): void {
+    this.entries.delete(key);
+
+    if (this.entries.size >= this.maxEntries) {
+      const oldestKey = this.entries.keys().next().value;
+      if (oldestKey !== undefined) {
+        this.entries.delete(oldestKey);
+      }
+    }
+
+    this.entries.set(key, { value, expiresAt: Date.now() + this.ttlMs });
+  }
+
+  delete(key: K): void {
+    this.entries.delete(key);
+  }
+
+  clear(): void {
+    this.entries.clear();
+  }
+
+  get size(): number {
+    return this.entries.size;
+  }
+}
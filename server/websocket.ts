@@ -186,21 +186,38 @@ class ActivityNotificationService {
    * Broadcast activity notification to all connected clients for a specific landlord
    */
   broadcastActivity(userId: string, activity: any, userType: 'landlord' | 'tenant' = 'landlord') {
-    const clients = userType === 'landlord' 
+    this.sendToRoom(userId, userType, JSON.stringify({
+      type: 'activity',
+      data: activity,
+      timestamp: new Date().toISOString()
+    }));
+  }
+
+  /**
+   * Send a custom message to one user's connections (payment events, bills, etc.)
+   * Sent as-is without the activity wrapper, with a timestamp added if missing
+   */
+  sendToUser(userId: string, userType: 'landlord' | 'tenant', message: any) {
+    this.sendToRoom(userId, userType, JSON.stringify({
+      ...message,
+      timestamp: message.timestamp || new Date().toISOString()
+    }));
+  }
+
+  /**
+   * Send an already serialized message to every open socket in a user's room
+   * Only the named role's map is looked up, other users' sockets are never touched
+   */
+  private sendToRoom(userId: string, userType: 'landlord' | 'tenant', message: string) {
+    const clients = userType === 'landlord'
       ? this.landlordClients.get(userId)
       : this.tenantClients.get(userId);
-    
+
     if (!clients || clients.size === 0) {
       console.log(`📭 No active WebSocket clients for ${userType} ${userId}`);
       return;
     }
 
-    const message = JSON.stringify({
-      type: 'activity',
-      data: activity,
-      timestamp: new Date().toISOString()
-    });
-
     let successCount = 0;
     let failCount = 0;
 
@@ -218,7 +235,7 @@ class ActivityNotificationService {
       }
     });
 
-    console.log(`📤 Broadcast activity to ${userType} ${userId}: ${successCount} sent, ${failCount} failed`);
+    console.log(`📤 Broadcast to ${userType} ${userId}: ${successCount} sent, ${failCount} failed`);
   }
 
   /**
@@ -281,62 +298,8 @@ export const activityNotificationService = new ActivityNotificationService();
 
 /**
  * Helper function to broadcast a custom message to a specific user
- * Detects userType automatically (landlord or tenant)
  * Sends message directly without wrapping (for payment events, bills, etc.)
  */
-export function broadcastToUser(userId: string, message: any) {
-  // Try both landlord and tenant
-  const landlordClients = activityNotificationService['landlordClients'].get(userId);
-  const tenantClients = activityNotificationService['tenantClients'].get(userId);
-  
-  let successCount = 0;
-  let failCount = 0;
-  
-  // Add timestamp to message if not present
-  const messageWithTimestamp = {
-    ...message,
-    timestamp: message.timestamp || new Date().toISOString()
-  };
-  
-  const messageStr = JSON.stringify(messageWithTimestamp);
-  
-  // Send to landlord clients
-  if (landlordClients && landlordClients.size > 0) {
-    landlordClients.forEach((client) => {
-      if (client.readyState === WebSocket.OPEN) {
-        try {
-          client.send(messageStr);
-          successCount++;
-        } catch (error) {
-          console.error(`❌ Error sending to landlord client:`, error);
-          failCount++;
-        }
-      }
-    });
-    console.log(`📤 Broadcast to landlord ${userId}: ${successCount} sent, ${failCount} failed`);
-  }
-  
-  // Reset counters for tenant broadcast
-  successCount = 0;
-  failCount = 0;
-  
-  // Send to tenant clients
-  if (tenantClients && tenantClients.size > 0) {
-    tenantClients.forEach((client) => {
-      if (client.readyState === WebSocket.OPEN) {
-        try {
-          client.send(messageStr);
-          successCount++;
-        } catch (error) {
-          console.error(`❌ Error sending to tenant client:`, error);
-          failCount++;
-        }
-      }
-    });
-    console.log(`📤 Broadcast to tenant ${userId}: ${successCount} sent, ${failCount} failed`);
-  }
-  
-  if (!landlordClients && !tenantClients) {
-    console.log(`📭 No active WebSocket connections for user ${userId}`);
-  }
+export function broadcastToUser(userId: string, message: any, userType: 'landlord' | 'tenant') {
+  activityNotificationService.sendToUser(userId, userType, message);
 }